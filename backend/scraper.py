@@ -1,152 +1,203 @@
 import asyncio
 import logging
 from typing import Dict, List, Optional, Any
-from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import Browser, Page, TimeoutError as PlaywrightTimeoutError
 import re
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+_FOLLOWERS_RE = re.compile(r'([\d,]+)\s*followers', re.IGNORECASE)
+_NUM_RE = re.compile(r'([\d,]+)')
+
+# In-page extraction scripts: each returns a whole section in one CDP round-trip
+_JS_TOP_CARD = """
+() => {
+    const text = (sel) => document.querySelector(sel)?.textContent?.trim() ?? null;
+    return {
+        page_name: text("h1.org-top-card-summary__title"),
+        profile_picture: document.querySelector("img.org-top-card-primary-content__logo")?.getAttribute("src") ?? null,
+        description: text("p.org-top-card-summary__tagline"),
+        followers_text: document.querySelector(".org-top-card-summary-info-list__info-item")?.textContent ?? null
+    };
+}
+"""
+
+_JS_ABOUT = """
+() => {
+    const text = (sel) => document.querySelector(sel)?.textContent?.trim() ?? null;
+    return {
+        industry: text("dd.org-about-company-module__industry"),
+        company_size: text("dd.org-about-company-module__company-size-definition-text"),
+        headquarters: text("dd.org-about-company-module__headquarters"),
+        founded: text("dd.org-about-company-module__founded"),
+        website: document.querySelector("a.org-about-us-company-module__website")?.getAttribute("href") ?? null,
+        specialties: text("dd.org-about-company-module__specialities")
+    };
+}
+"""
+
+_JS_POST_CARDS = """
+(cards) => cards.slice(0, 20).map((card) => ({
+    content: card.querySelector(".feed-shared-text")?.textContent?.trim() ?? null,
+    posted_date: card.querySelector(".feed-shared-actor__sub-description")?.textContent?.trim() ?? null,
+    likes_text: card.querySelector(".social-details-social-counts__reactions-count")?.textContent ?? null,
+    comments_text: card.querySelector(".social-details-social-counts__comments")?.textContent ?? null
+}))
+"""
+
+_JS_SCROLL_AND_COUNT_POSTS = """
+() => {
+    window.scrollBy(0, 1000);
+    return document.querySelectorAll(".feed-shared-update-v2").length;
+}
+"""
+
+_JS_MORE_POSTS_LOADED = """
+(prev) => document.querySelectorAll(".feed-shared-update-v2").length > prev
+"""
+
+_JS_EMPLOYEE_CARDS = """
+() => Array.from(document.querySelectorAll(".org-people-profile-card")).slice(0, 50).map((card) => {
+    const link = card.querySelector("a.app-aware-link");
+    return {
+        name: link?.textContent?.trim() ?? null,
+        profile_url: link?.getAttribute("href") ?? null,
+        profile_picture: card.querySelector("img")?.getAttribute("src") ?? null,
+        title: card.querySelector(".org-people-profile-card__profile-title")?.textContent?.trim() ?? null
+    };
+})
+"""
+
 
 class LinkedInScraper:
-    def __init__(self):
+    def __init__(self, browser: Optional[Browser] = None):
         self.base_url = "https://www.linkedin.com"
+        # Long-lived browser owned by the app; each scrape gets its own context
+        self.browser = browser
         
     async def scrape_page(self, page_id: str) -> Dict[str, Any]:
         """
         Scrape LinkedIn company page data
         """
+        if self.browser is None:
+            raise RuntimeError("Scraper browser has not been started")
+        
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            context = await self.browser.new_context(
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            )
+            try:
+                # One tab per section so the extractors can navigate independently
+                info_page, posts_page, people_page = await asyncio.gather(
+                    *(context.new_page() for _ in range(3))
                 )
-                page = await context.new_page()
                 
                 company_url = f"{self.base_url}/company/{page_id}/"
                 
-                try:
-                    await page.goto(company_url, wait_until="networkidle", timeout=30000)
-                    await asyncio.sleep(2)
-                except PlaywrightTimeoutError:
-                    logger.warning(f"Timeout loading {company_url}, continuing anyway")
-                
-                # Extract page data
-                page_data = await self._extract_page_info(page, page_id, company_url)
-                
-                # Extract posts
-                posts = await self._extract_posts(page, page_id)
-                
-                # Extract employees (limited)
-                employees = await self._extract_employees(page, page_id)
-                
-                await browser.close()
+                await asyncio.gather(
+                    *(self._load_company_page(tab, company_url)
+                      for tab in (info_page, posts_page, people_page))
+                )
                 
-                return {
-                    "page": page_data,
-                    "posts": posts,
-                    "employees": employees
-                }
+                # Extract page data, posts and employees (limited) concurrently
+                page_data, posts, employees = await asyncio.gather(
+                    self._extract_page_info(info_page, page_id, company_url),
+                    self._extract_posts(posts_page, page_id),
+                    self._extract_employees(people_page, page_id)
+                )
+            finally:
+                await context.close()
+            
+            # Stamp the page so it can be stored as-is (BSON dates)
+            scraped_at = datetime.utcnow()
+            page_data["scraped_at"] = scraped_at
+            page_data["updated_at"] = scraped_at
+            
+            return {
+                "page": page_data,
+                "posts": posts,
+                "employees": employees
+            }
                 
         except Exception as e:
             logger.error(f"Error scraping page {page_id}: {str(e)}")
             raise
     
+    async def _load_company_page(self, page: Page, url: str) -> None:
+        """Load the company page, tolerating slow network idle"""
+        try:
+            await page.goto(url, wait_until="networkidle", timeout=30000)
+        except PlaywrightTimeoutError:
+            logger.warning(f"Timeout loading {url}, continuing anyway")
+    
+    async def _wait_for_selector(self, page: Page, selector: str, timeout: int) -> bool:
+        """
+        Wait for a selector to render instead of sleeping a fixed time.
+        timeout (ms) is capped at the sleep it replaces, so blocked pages are no slower.
+        """
+        try:
+            await page.wait_for_selector(selector, timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            logger.debug(f"Timed out waiting for {selector}")
+            return False
+    
     async def _extract_page_info(self, page: Page, page_id: str, url: str) -> Dict[str, Any]:
         """Extract company page information"""
+        data = {
+            "page_id": page_id,
+            "page_url": url,
+            "linkedin_id": page_id,
+            "page_name": None,
+            "profile_picture": None,
+            "cover_image": None,
+            "description": None,
+            "website": None,
+            "industry": None,
+            "company_size": None,
+            "headquarters": None,
+            "founded": None,
+            "specialties": [],
+            "follower_count": 0,
+            "employee_count": 0
+        }
+        
         try:
-            data = {
-                "page_id": page_id,
-                "page_url": url,
-                "linkedin_id": page_id,
-                "page_name": None,
-                "profile_picture": None,
-                "cover_image": None,
-                "description": None,
-                "website": None,
-                "industry": None,
-                "company_size": None,
-                "headquarters": None,
-                "founded": None,
-                "specialties": [],
-                "follower_count": 0,
-                "employee_count": 0
-            }
-            
-            # Company name
-            try:
-                name_elem = await page.query_selector("h1.org-top-card-summary__title")
-                if name_elem:
-                    data["page_name"] = (await name_elem.text_content()).strip()
-            except Exception as e:
-                logger.debug(f"Could not extract company name: {e}")
-            
-            # Profile picture
-            try:
-                img_elem = await page.query_selector("img.org-top-card-primary-content__logo")
-                if img_elem:
-                    data["profile_picture"] = await img_elem.get_attribute("src")
-            except Exception as e:
-                logger.debug(f"Could not extract profile picture: {e}")
-            
-            # Description
-            try:
-                desc_elem = await page.query_selector("p.org-top-card-summary__tagline")
-                if desc_elem:
-                    data["description"] = (await desc_elem.text_content()).strip()
-            except Exception as e:
-                logger.debug(f"Could not extract description: {e}")
-            
-            # Followers
+            # Name, profile picture, description and followers
             try:
-                followers_elem = await page.query_selector(".org-top-card-summary-info-list__info-item")
-                if followers_elem:
-                    text = await followers_elem.text_content()
-                    match = re.search(r'([\d,]+)\s*followers', text, re.IGNORECASE)
+                top_card = await page.evaluate(_JS_TOP_CARD)
+                data["page_name"] = top_card["page_name"]
+                data["profile_picture"] = top_card["profile_picture"]
+                data["description"] = top_card["description"]
+                if top_card["followers_text"]:
+                    match = _FOLLOWERS_RE.search(top_card["followers_text"])
                     if match:
                         data["follower_count"] = int(match.group(1).replace(',', ''))
             except Exception as e:
-                logger.debug(f"Could not extract followers: {e}")
+                logger.debug(f"Could not extract top card: {e}")
             
             # About section details
             try:
                 await page.click("a[href*='about']", timeout=5000)
-                await asyncio.sleep(1)
+                await self._wait_for_selector(page, "dd[class*='org-about-company-module']", timeout=1000)
                 
-                # Industry
-                industry_elem = await page.query_selector("dd.org-about-company-module__industry")
-                if industry_elem:
-                    data["industry"] = (await industry_elem.text_content()).strip()
+                about = await page.evaluate(_JS_ABOUT)
+                data["industry"] = about["industry"]
+                data["headquarters"] = about["headquarters"]
+                data["founded"] = about["founded"]
+                data["website"] = about["website"]
                 
                 # Company size
-                size_elem = await page.query_selector("dd.org-about-company-module__company-size-definition-text")
-                if size_elem:
-                    data["company_size"] = (await size_elem.text_content()).strip()
-                    match = re.search(r'([\d,]+)', data["company_size"])
+                if about["company_size"] is not None:
+                    data["company_size"] = about["company_size"]
+                    match = _NUM_RE.search(data["company_size"])
                     if match:
                         data["employee_count"] = int(match.group(1).replace(',', ''))
                 
-                # Headquarters
-                hq_elem = await page.query_selector("dd.org-about-company-module__headquarters")
-                if hq_elem:
-                    data["headquarters"] = (await hq_elem.text_content()).strip()
-                
-                # Founded
-                founded_elem = await page.query_selector("dd.org-about-company-module__founded")
-                if founded_elem:
-                    data["founded"] = (await founded_elem.text_content()).strip()
-                
-                # Website
-                website_elem = await page.query_selector("a.org-about-us-company-module__website")
-                if website_elem:
-                    data["website"] = await website_elem.get_attribute("href")
-                
                 # Specialties
-                spec_elem = await page.query_selector("dd.org-about-company-module__specialities")
-                if spec_elem:
-                    specialties_text = (await spec_elem.text_content()).strip()
-                    data["specialties"] = [s.strip() for s in specialties_text.split(',')]
+                if about["specialties"] is not None:
+                    data["specialties"] = [s.strip() for s in about["specialties"].split(',')]
                     
             except Exception as e:
                 logger.debug(f"Could not extract about section: {e}")
@@ -155,7 +206,7 @@ class LinkedInScraper:
             
         except Exception as e:
             logger.error(f"Error extracting page info: {e}")
-            return {}
+            return data
     
     async def _extract_posts(self, page: Page, page_id: str) -> List[Dict[str, Any]]:
         """Extract recent posts from company page"""
@@ -164,25 +215,31 @@ class LinkedInScraper:
             # Navigate to posts
             try:
                 await page.click("a[href*='posts']", timeout=5000)
-                await asyncio.sleep(2)
+                await self._wait_for_selector(page, ".feed-shared-update-v2", timeout=2000)
             except:
                 logger.debug("Could not navigate to posts section")
             
-            # Scroll to load posts
+            # Scroll to load posts, stopping early once scrolling loads nothing new
             for _ in range(3):
-                await page.evaluate("window.scrollBy(0, 1000)")
-                await asyncio.sleep(1)
+                prev_count = await page.evaluate(_JS_SCROLL_AND_COUNT_POSTS)
+                try:
+                    await page.wait_for_function(_JS_MORE_POSTS_LOADED, arg=prev_count, timeout=1000)
+                except PlaywrightTimeoutError:
+                    break
             
             # Extract posts
-            post_cards = await page.query_selector_all(".feed-shared-update-v2")
+            post_cards = await page.locator(".feed-shared-update-v2").evaluate_all(_JS_POST_CARDS)
+            
+            # One timestamp for the whole batch of post_ids
+            ts = int(datetime.utcnow().timestamp())
             
-            for idx, post_card in enumerate(post_cards[:20]):
+            for idx, post_card in enumerate(post_cards):
                 try:
                     post_data = {
-                        "post_id": f"{page_id}_post_{idx}_{int(datetime.utcnow().timestamp())}",
+                        "post_id": f"{page_id}_post_{idx}_{ts}",
                         "page_id": page_id,
                         "content": None,
-                        "posted_date": None,
+                        "posted_date": post_card["posted_date"],
                         "likes": 0,
                         "comments_count": 0,
                         "shares": 0,
@@ -191,27 +248,17 @@ class LinkedInScraper:
                     }
                     
                     # Content
-                    content_elem = await post_card.query_selector(".feed-shared-text")
-                    if content_elem:
-                        post_data["content"] = (await content_elem.text_content()).strip()[:500]
-                    
-                    # Post date
-                    date_elem = await post_card.query_selector(".feed-shared-actor__sub-description")
-                    if date_elem:
-                        post_data["posted_date"] = (await date_elem.text_content()).strip()
+                    if post_card["content"] is not None:
+                        post_data["content"] = post_card["content"][:500]
                     
                     # Engagement metrics
-                    likes_elem = await post_card.query_selector(".social-details-social-counts__reactions-count")
-                    if likes_elem:
-                        likes_text = await likes_elem.text_content()
-                        match = re.search(r'([\d,]+)', likes_text)
+                    if post_card["likes_text"]:
+                        match = _NUM_RE.search(post_card["likes_text"])
                         if match:
                             post_data["likes"] = int(match.group(1).replace(',', ''))
                     
-                    comments_elem = await post_card.query_selector(".social-details-social-counts__comments")
-                    if comments_elem:
-                        comments_text = await comments_elem.text_content()
-                        match = re.search(r'([\d,]+)', comments_text)
+                    if post_card["comments_text"]:
+                        match = _NUM_RE.search(post_card["comments_text"])
                         if match:
                             post_data["comments_count"] = int(match.group(1).replace(',', ''))
                     
@@ -233,47 +280,24 @@ class LinkedInScraper:
             # Navigate to people section
             try:
                 await page.click("a[href*='people']", timeout=5000)
-                await asyncio.sleep(2)
+                await self._wait_for_selector(page, ".org-people-profile-card", timeout=2000)
             except:
                 logger.debug("Could not navigate to people section")
                 return employees
             
             # Extract employee cards
-            employee_cards = await page.query_selector_all(".org-people-profile-card")
+            employee_cards = await page.evaluate(_JS_EMPLOYEE_CARDS)
             
-            for idx, card in enumerate(employee_cards[:50]):
-                try:
-                    employee_data = {
+            for idx, card in enumerate(employee_cards):
+                if card["name"]:
+                    employees.append({
                         "user_id": f"{page_id}_user_{idx}",
-                        "name": None,
-                        "profile_url": None,
-                        "profile_picture": None,
-                        "title": None,
+                        "name": card["name"],
+                        "profile_url": card["profile_url"],
+                        "profile_picture": card["profile_picture"],
+                        "title": card["title"],
                         "page_id": page_id
-                    }
-                    
-                    # Name and profile URL
-                    name_elem = await card.query_selector("a.app-aware-link")
-                    if name_elem:
-                        employee_data["name"] = (await name_elem.text_content()).strip()
-                        employee_data["profile_url"] = await name_elem.get_attribute("href")
-                    
-                    # Profile picture
-                    img_elem = await card.query_selector("img")
-                    if img_elem:
-                        employee_data["profile_picture"] = await img_elem.get_attribute("src")
-                    
-                    # Title
-                    title_elem = await card.query_selector(".org-people-profile-card__profile-title")
-                    if title_elem:
-                        employee_data["title"] = (await title_elem.text_content()).strip()
-                    
-                    if employee_data["name"]:
-                        employees.append(employee_data)
-                        
-                except Exception as e:
-                    logger.debug(f"Error extracting employee {idx}: {e}")
-                    continue
+                    })
                     
         except Exception as e:
             logger.error(f"Error extracting employees: {e}")
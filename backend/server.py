@@ -1,13 +1,21 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Query
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError, OperationFailure
+from cachetools import TTLCache
+from playwright.async_api import async_playwright
 import os
 import logging
 from pathlib import Path
-from typing import Optional, List
-import math
+from typing import Optional, List, Tuple
 from datetime import datetime
+import math
+
+import pydantic_core
+from pydantic import BaseModel
 
 from models import (
     LinkedInPage, LinkedInPost, LinkedInUser,
@@ -28,9 +36,14 @@ db = client[os.environ['DB_NAME']]
 pages_collection = db.linkedin_pages
 posts_collection = db.linkedin_posts
 users_collection = db.linkedin_users
+migrations_collection = db.migrations
 
 # Create the main app without a prefix
-app = FastAPI(title="LinkedIn Insights API", version="1.0.0")
+app = FastAPI(
+    title="LinkedIn Insights API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -38,6 +51,62 @@ api_router = APIRouter(prefix="/api")
 # Initialize scraper
 scraper = LinkedInScraper()
 
+# Case-insensitive collation shared by the page_name index and name search
+_NAME_COLLATION = {"locale": "en", "strength": 2}
+
+# Every stored page_id, loaded at startup and kept current on insert.
+# Pages are never deleted, so a miss is a definite 404 without touching MongoDB.
+_KNOWN_PAGE_IDS = set()
+
+# Serialized get_page bodies
+_PAGE_RESPONSES = TTLCache(maxsize=1_000, ttl=60)
+
+
+def _json_response(model: BaseModel) -> Response:
+    """
+    Serialize a model straight to JSON bytes with pydantic-core.
+    Returning a Response skips FastAPI's response_model re-validation.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+async def _paginate(
+    collection, query: dict, skip: int, limit: int, collation: Optional[dict] = None
+) -> Tuple[List[dict], int]:
+    """
+    Fetch one page of documents and the total match count
+    in a single aggregation round-trip.
+    """
+    pipeline = [
+        {"$match": query},
+        {"$project": {"_id": 0}},
+        {"$facet": {
+            "items": [{"$skip": skip}, {"$limit": limit}],
+            "total": [{"$count": "n"}]
+        }}
+    ]
+    options = {"collation": collation} if collation else {}
+    result = (await collection.aggregate(pipeline, **options).to_list(length=1))[0]
+    total = result["total"][0]["n"] if result["total"] else 0
+    return result["items"], total
+
+
+def _ensure_page_exists(page_id: str) -> None:
+    """
+    Raise a 404 unless the page is stored.
+    """
+    if page_id not in _KNOWN_PAGE_IDS:
+        raise HTTPException(status_code=404, detail="Page not found")
+
+
+def _cache_page_response(page_id: str, response: Response) -> Response:
+    """
+    Remember a get_page response body so repeat lookups skip MongoDB.
+    """
+    _KNOWN_PAGE_IDS.add(page_id)
+    _PAGE_RESPONSES[page_id] = response.body
+    return response
+
 
 @api_router.get("/")
 async def root():
@@ -50,16 +119,16 @@ async def get_page(page_id: str):
     Get LinkedIn page details by page_id.
     If not in DB, scrape in real-time.
     """
+    cached_body = _PAGE_RESPONSES.get(page_id)
+    if cached_body is not None:
+        return Response(content=cached_body, media_type="application/json")
+    
     # Check if page exists in DB
     existing_page = await pages_collection.find_one({"page_id": page_id}, {"_id": 0})
     
     if existing_page:
-        # Convert datetime strings back to datetime objects if needed
-        if isinstance(existing_page.get('scraped_at'), str):
-            existing_page['scraped_at'] = datetime.fromisoformat(existing_page['scraped_at'])
-        if isinstance(existing_page.get('updated_at'), str):
-            existing_page['updated_at'] = datetime.fromisoformat(existing_page['updated_at'])
-        return LinkedInPage(**existing_page)
+        page_obj = LinkedInPage.model_construct(**existing_page)
+        return _cache_page_response(page_id, _json_response(page_obj))
     
     # Scrape if not found
     try:
@@ -67,31 +136,23 @@ async def get_page(page_id: str):
         
         # Store page data
         page_data = scraped_data["page"]
-        page_obj = LinkedInPage(**page_data)
-        page_dict = page_obj.model_dump()
-        page_dict['scraped_at'] = page_dict['scraped_at'].isoformat()
-        page_dict['updated_at'] = page_dict['updated_at'].isoformat()
-        await pages_collection.insert_one(page_dict)
+        page_obj = LinkedInPage.model_construct(**page_data)
+        try:
+            await pages_collection.insert_one(page_data)
+        except DuplicateKeyError:
+            # A concurrent request scraped and stored this page first; serve its copy
+            existing_page = await pages_collection.find_one({"page_id": page_id}, {"_id": 0})
+            page_obj = LinkedInPage.model_construct(**existing_page)
+            return _cache_page_response(page_id, _json_response(page_obj))
         
-        # Store posts
+        # Store posts and employees as produced by the scraper
         if scraped_data["posts"]:
-            posts_to_insert = []
-            for post in scraped_data["posts"]:
-                post_obj = LinkedInPost(**post)
-                posts_to_insert.append(post_obj.model_dump())
-            if posts_to_insert:
-                await posts_collection.insert_many(posts_to_insert)
+            await posts_collection.insert_many(scraped_data["posts"], ordered=False)
         
-        # Store employees
         if scraped_data["employees"]:
-            users_to_insert = []
-            for emp in scraped_data["employees"]:
-                user_obj = LinkedInUser(**emp)
-                users_to_insert.append(user_obj.model_dump())
-            if users_to_insert:
-                await users_collection.insert_many(users_to_insert)
+            await users_collection.insert_many(scraped_data["employees"], ordered=False)
         
-        return page_obj
+        return _cache_page_response(page_id, _json_response(page_obj))
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error scraping page: {str(e)}")
@@ -101,7 +162,7 @@ async def get_page(page_id: str):
 async def list_pages(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
-    name: Optional[str] = Query(None, description="Search by page name"),
+    name: Optional[str] = Query(None, description="Search by page name prefix (case-insensitive)"),
     industry: Optional[str] = Query(None, description="Filter by industry"),
     follower_count_min: Optional[int] = Query(None, ge=0, description="Minimum follower count"),
     follower_count_max: Optional[int] = Query(None, ge=0, description="Maximum follower count")
@@ -112,8 +173,12 @@ async def list_pages(
     # Build query
     query = {}
     
+    collation = None
     if name:
-        query["page_name"] = {"$regex": name, "$options": "i"}
+        # Prefix range under the collated index: case-insensitive and index-bounded.
+        # U+FFFF sorts after every other character in ICU collations.
+        query["page_name"] = {"$gte": name, "$lt": name + "\uffff"}
+        collation = _NAME_COLLATION
     
     if industry:
         query["industry"] = {"$regex": industry, "$options": "i"}
@@ -125,33 +190,21 @@ async def list_pages(
         if follower_count_max is not None:
             query["follower_count"]["$lte"] = follower_count_max
     
-    # Get total count
-    total = await pages_collection.count_documents(query)
-    
-    # Calculate pagination
+    # Get pages and total count
     skip = (page - 1) * page_size
+    pages_list, total = await _paginate(pages_collection, query, skip, page_size, collation)
     total_pages = math.ceil(total / page_size) if total > 0 else 0
     
-    # Get pages
-    pages_cursor = pages_collection.find(query, {"_id": 0}).skip(skip).limit(page_size)
-    pages_list = await pages_cursor.to_list(length=page_size)
-    
-    # Convert datetime strings
-    for p in pages_list:
-        if isinstance(p.get('scraped_at'), str):
-            p['scraped_at'] = datetime.fromisoformat(p['scraped_at'])
-        if isinstance(p.get('updated_at'), str):
-            p['updated_at'] = datetime.fromisoformat(p['updated_at'])
+    construct_page = LinkedInPage.model_construct
+    pages_objects = [construct_page(**p) for p in pages_list]
     
-    pages_objects = [LinkedInPage(**p) for p in pages_list]
-    
-    return PageListResponse(
+    return _json_response(PageListResponse(
         pages=pages_objects,
         total=total,
         page=page,
         page_size=page_size,
         total_pages=total_pages
-    )
+    ))
 
 
 @api_router.get("/pages/{page_id}/posts", response_model=PostListResponse)
@@ -164,29 +217,24 @@ async def get_page_posts(
     Get recent posts for a LinkedIn page with pagination.
     """
     # Check if page exists
-    page_exists = await pages_collection.find_one({"page_id": page_id})
-    if not page_exists:
-        raise HTTPException(status_code=404, detail="Page not found")
+    _ensure_page_exists(page_id)
     
     # Get posts
     query = {"page_id": page_id}
-    total = await posts_collection.count_documents(query)
-    
     skip = (page - 1) * page_size
+    posts_list, total = await _paginate(posts_collection, query, skip, page_size)
     total_pages = math.ceil(total / page_size) if total > 0 else 0
     
-    posts_cursor = posts_collection.find(query, {"_id": 0}).skip(skip).limit(page_size)
-    posts_list = await posts_cursor.to_list(length=page_size)
+    construct_post = LinkedInPost.model_construct
+    posts_objects = [construct_post(**p) for p in posts_list]
     
-    posts_objects = [LinkedInPost(**p) for p in posts_list]
-    
-    return PostListResponse(
+    return _json_response(PostListResponse(
         posts=posts_objects,
         total=total,
         page=page,
         page_size=page_size,
         total_pages=total_pages
-    )
+    ))
 
 
 @api_router.get("/pages/{page_id}/employees", response_model=UserListResponse)
@@ -199,29 +247,24 @@ async def get_page_employees(
     Get employees/people working at a LinkedIn page with pagination.
     """
     # Check if page exists
-    page_exists = await pages_collection.find_one({"page_id": page_id})
-    if not page_exists:
-        raise HTTPException(status_code=404, detail="Page not found")
+    _ensure_page_exists(page_id)
     
     # Get users
     query = {"page_id": page_id}
-    total = await users_collection.count_documents(query)
-    
     skip = (page - 1) * page_size
+    users_list, total = await _paginate(users_collection, query, skip, page_size)
     total_pages = math.ceil(total / page_size) if total > 0 else 0
     
-    users_cursor = users_collection.find(query, {"_id": 0}).skip(skip).limit(page_size)
-    users_list = await users_cursor.to_list(length=page_size)
-    
-    users_objects = [LinkedInUser(**u) for u in users_list]
+    construct_user = LinkedInUser.model_construct
+    users_objects = [construct_user(**u) for u in users_list]
     
-    return UserListResponse(
+    return _json_response(UserListResponse(
         users=users_objects,
         total=total,
         page=page,
         page_size=page_size,
         total_pages=total_pages
-    )
+    ))
 
 
 @api_router.get("/pages/{page_id}/followers")
@@ -231,6 +274,8 @@ async def get_page_followers(page_id: str):
     Note: LinkedIn doesn't easily expose follower lists via scraping.
     This endpoint returns follower count from page data.
     """
+    _ensure_page_exists(page_id)
+    
     page_data = await pages_collection.find_one({"page_id": page_id}, {"_id": 0})
     if not page_data:
         raise HTTPException(status_code=404, detail="Page not found")
@@ -254,6 +299,7 @@ async def create_demo_page(page_id: str):
     # Check if page already exists
     existing = await pages_collection.find_one({"page_id": page_id})
     if existing:
+        _KNOWN_PAGE_IDS.add(page_id)
         return {"message": "Page already exists", "page_id": page_id}
     
     # Create mock page data
@@ -272,11 +318,12 @@ async def create_demo_page(page_id: str):
         "specialties": ["Cloud Computing", "Artificial Intelligence", "Software Development", "Data Analytics"],
         "follower_count": random.randint(50000, 500000),
         "employee_count": random.randint(1000, 10000),
-        "scraped_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat()
+        "scraped_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc)
     }
     
     await pages_collection.insert_one(demo_data)
+    _KNOWN_PAGE_IDS.add(page_id)
     
     # Create mock posts
     posts = []
@@ -341,6 +388,89 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def check_pydantic_core():
+    # Validation and serialization run in pydantic-core; a debug build is several times slower
+    build_profile = pydantic_core._pydantic_core.build_profile
+    if build_profile != "release":
+        logger.warning(f"pydantic-core {pydantic_core.__version__} is a '{build_profile}' build; "
+                       "install the prebuilt release wheel for production")
+
+
+@app.on_event("startup")
+async def create_indexes():
+    # Back the page_id lookups, name/follower filters and paginated listings
+    try:
+        await pages_collection.create_index("page_id", unique=True)
+    except OperationFailure as e:
+        # Pages stored before the index existed may repeat a page_id; keep serving meanwhile
+        logger.error(f"Could not create unique page_id index: {e}. "
+                     "Remove duplicate linkedin_pages documents and restart to enable it")
+    await pages_collection.create_index("follower_count")
+    await pages_collection.create_index("page_name", collation=_NAME_COLLATION)
+    await posts_collection.create_index("page_id")
+    await users_collection.create_index("page_id")
+
+
+@app.on_event("startup")
+async def migrate_page_timestamps():
+    # One-off: pages stored before timestamps became BSON dates still hold ISO strings.
+    # A marker document records the run, so later startups skip the unindexed scan.
+    if await migrations_collection.find_one({"_id": "page_timestamps_to_dates"}):
+        return
+    
+    updates = []
+    async for doc in pages_collection.find(
+        {"$or": [{"scraped_at": {"$type": "string"}}, {"updated_at": {"$type": "string"}}]},
+        {"page_id": 1, "scraped_at": 1, "updated_at": 1}
+    ):
+        try:
+            fields = {
+                key: datetime.fromisoformat(doc[key])
+                for key in ("scraped_at", "updated_at") if isinstance(doc.get(key), str)
+            }
+        except ValueError as e:
+            logger.warning(f"Leaving timestamps of page {doc.get('page_id')} as stored: {e}")
+            continue
+        updates.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+    
+    if updates:
+        await pages_collection.bulk_write(updates, ordered=False)
+        logger.info(f"Converted timestamps of {len(updates)} pages to BSON dates")
+    await migrations_collection.update_one(
+        {"_id": "page_timestamps_to_dates"},
+        {"$setOnInsert": {"applied_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+@app.on_event("startup")
+async def load_known_page_ids():
+    async for doc in pages_collection.find({}, {"page_id": 1, "_id": 0}):
+        _KNOWN_PAGE_IDS.add(doc["page_id"])
+    logger.info(f"Loaded {len(_KNOWN_PAGE_IDS)} known page ids")
+
+
+@app.on_event("startup")
+async def start_browser():
+    # Launch Chromium once and share it across scrapes
+    app.state.playwright = None
+    app.state.browser = None
+    try:
+        app.state.playwright = await async_playwright().start()
+        app.state.browser = await app.state.playwright.chromium.launch(headless=True)
+    except Exception as e:
+        # Stored pages and demo data are still served; only live scraping is unavailable
+        logger.error(f"Could not launch browser, scraping disabled: {e}")
+        return
+    scraper.browser = app.state.browser
+
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
+    scraper.browser = None
+    if app.state.browser is not None:
+        await app.state.browser.close()
+    if app.state.playwright is not None:
+        await app.state.playwright.stop()